@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pyarrow.feather as feather
+import logging
 from data_processor_chunked import DataProcessor
-from visualization import VisualizationGenerator
+from cell_type_order import cell_type_sort_key
 import os
 
 # Configure page
@@ -13,38 +13,67 @@ st.set_page_config(
     layout="wide"
 )
 
+logger = logging.getLogger(__name__)
+
+# Low-cardinality metadata columns used by the smart filters - stored as category so
+# equality filters compare integer codes instead of Python strings
+CATEGORICAL_METADATA_COLUMNS = ['cargo', 'experiment', 'proximal_gene', 'GC delivered', 'enhancer_id']
+
 # Initialize data processor
-@st.cache_data
+# cache_resource shares one copy of the frames across reruns and sessions without
+# pickling them on every access - callers must treat the returned frames as read-only
+@st.cache_resource
 def load_data():
-    """Load and process all data files"""
+    """Load and process all data files - returned frames are shared, do not mutate them"""
     processor = DataProcessor()
-    print("Loading data with chunked processor...")
-    result = processor.load_all_data()
-    print(f"Data loaded: {len(result[2])} HOF enhancers" if result[2] is not None else "No HOF enhancers loaded")
-    return result
+    logger.debug("Loading data with chunked processor...")
+    peak_data, enhancer_metadata, hof_enhancers = processor.load_all_data()
+    logger.debug("Data loaded: %s HOF enhancers", len(hof_enhancers) if hof_enhancers is not None else 'no')
+    
+    if enhancer_metadata is not None:
+        for column in CATEGORICAL_METADATA_COLUMNS:
+            if column in enhancer_metadata.columns:
+                enhancer_metadata[column] = enhancer_metadata[column].astype('category')
+    if peak_data is not None and 'cell_type' in peak_data.columns:
+        # Categories in numeric order (1-34) so the sorted cell type list is read straight off the dtype
+        cell_types = sorted(peak_data['cell_type'].unique(), key=cell_type_sort_key)
+        peak_data['cell_type'] = pd.Categorical(peak_data['cell_type'], categories=cell_types, ordered=True)
+        # Sorted (enhancer_id, cell_type) index turns the detail view's two column scans into index lookups
+        peak_data = peak_data.set_index(['enhancer_id', 'cell_type']).sort_index()
+    if hof_enhancers is not None and 'enhancer_id' in hof_enhancers.columns:
+        # ONE record per enhancer, deduplicated once here instead of on every rerun
+        hof_enhancers = hof_enhancers.drop_duplicates(subset=['enhancer_id'], keep='first')
+        hof_enhancers['enhancer_id'] = hof_enhancers['enhancer_id'].astype('category')
+    
+    return peak_data, enhancer_metadata, hof_enhancers
+
+@st.cache_resource
+def get_viz():
+    """Shared VisualizationGenerator instance"""
+    # Imported here so plotly is only loaded once a plot is actually requested
+    from visualization import VisualizationGenerator
+    return VisualizationGenerator()
 
 # Load data
 try:
     peak_data, enhancer_metadata, hof_enhancers = load_data()
     
     # Debug information
-    print(f"DEBUG - Peak data: {len(peak_data)} rows" if peak_data is not None else "DEBUG - Peak data: None")
-    print(f"DEBUG - HOF enhancers: {len(hof_enhancers)} records" if hof_enhancers is not None else "DEBUG - HOF enhancers: None")
-    print(f"DEBUG - Metadata: {len(enhancer_metadata)} records" if enhancer_metadata is not None else "DEBUG - Metadata: None")
+    logger.debug("Peak data: %s rows", len(peak_data) if peak_data is not None else None)
+    logger.debug("HOF enhancers: %s records", len(hof_enhancers) if hof_enhancers is not None else None)
+    logger.debug("Metadata: %s records", len(enhancer_metadata) if enhancer_metadata is not None else None)
     
     if hof_enhancers is not None and not hof_enhancers.empty:
-        print(f"DEBUG - HOF enhancers columns: {list(hof_enhancers.columns)}")
-        print(f"DEBUG - Sample HOF enhancer: {hof_enhancers.iloc[0]['enhancer_id']}")
+        logger.debug("HOF enhancers columns: %s", list(hof_enhancers.columns))
+        logger.debug("Sample HOF enhancer: %s", hof_enhancers.iloc[0]['enhancer_id'])
         st.success(f"✅ App loaded successfully! {len(hof_enhancers)} enhancers available.")
     else:
-        print("DEBUG - HOF enhancers is None or empty!")
+        logger.warning("HOF enhancers is None or empty")
         st.warning("⚠️ Data loaded but no HOF enhancers found. Debugging...")
         
 except Exception as e:
     st.error(f"❌ Error loading data: {str(e)}")
-    print(f"DEBUG - Load error: {str(e)}")
-    import traceback
-    traceback.print_exc()
+    logger.exception("Error loading data")
     st.stop()
 
 # Compact title
@@ -55,16 +84,42 @@ st.sidebar.header("🔍 Filters & Selection")
 st.sidebar.markdown("Choose filters to focus your analysis")
 
 # Smart filtering logic - get base data first
-base_enhancers = sorted(hof_enhancers['enhancer_id'].unique()) if hof_enhancers is not None and 'enhancer_id' in hof_enhancers.columns else []
-base_metadata = enhancer_metadata[enhancer_metadata['enhancer_id'].isin(base_enhancers)] if enhancer_metadata is not None and not enhancer_metadata.empty else pd.DataFrame()
+# The loaded data never changes during a session, so these helpers take the frames as
+# underscore (unhashed) arguments and run once instead of on every widget interaction.
+# cache_resource hands back the same objects on every hit instead of unpickling a copy
+@st.cache_resource
+def _base_enhancers(_hof_enhancers):
+    """Sorted list of unique Hall of Fame enhancer IDs - shared, do not mutate"""
+    if _hof_enhancers is None or 'enhancer_id' not in _hof_enhancers.columns:
+        return []
+    # Categories of a freshly cast column are the sorted unique values
+    return list(_hof_enhancers['enhancer_id'].cat.categories)
+
+@st.cache_resource
+def _hof_enhancer_ids(_hof_enhancers):
+    """Index of Hall of Fame enhancer IDs used as the starting point for metadata filters"""
+    if _hof_enhancers is None or _hof_enhancers.empty:
+        return pd.Index([])
+    return pd.Index(_hof_enhancers['enhancer_id'].cat.categories)
+
+@st.cache_resource
+def _base_metadata(_enhancer_metadata, _hof_enhancers):
+    """Metadata rows belonging to Hall of Fame enhancers - shared, do not mutate"""
+    if _enhancer_metadata is None or _enhancer_metadata.empty:
+        return pd.DataFrame()
+    return _enhancer_metadata[_enhancer_metadata['enhancer_id'].isin(_base_enhancers(_hof_enhancers))]
 
-# Sort cell types numerically by their leading numbers (1-34)
-import re
-def extract_cell_type_number(cell_type):
-    match = re.match(r'^(\d+)', str(cell_type))
-    return int(match.group(1)) if match else 999
+@st.cache_resource
+def _metadata_by_enhancer(_enhancer_metadata):
+    """Metadata rows grouped by enhancer ID for O(1) lookups - shared, do not mutate"""
+    if _enhancer_metadata is None or _enhancer_metadata.empty:
+        return {}
+    return dict(list(_enhancer_metadata.groupby('enhancer_id', observed=True, sort=False)))
 
-base_cell_types = sorted(peak_data['cell_type'].unique(), key=extract_cell_type_number) if peak_data is not None and not peak_data.empty else []
+base_enhancers = _base_enhancers(hof_enhancers)
+base_metadata = _base_metadata(enhancer_metadata, hof_enhancers)
+# Cell types are categories already sorted numerically at load time
+base_cell_types = list(peak_data.index.levels[peak_data.index.names.index('cell_type')]) if peak_data is not None and not peak_data.empty else []
 
 # Initialize session state for filters if not exists
 if 'filter_state' not in st.session_state:
@@ -77,47 +132,53 @@ if 'filter_state' not in st.session_state:
         'cell_type': 'All'
     }
 
+# Metadata column behind each smart filter - cell type is independent and not listed
+FILTER_COLUMNS = {
+    'enhancer': 'enhancer_id',
+    'cargo': 'cargo',
+    'experiment': 'experiment',
+    'gene': 'proximal_gene',
+    'gc_delivered': 'GC delivered'
+}
+
+def _options(values):
+    """Sorted, non-empty option values of a categorical filter column"""
+    # Categories are already sorted and never contain NaN, so dropping the unused ones
+    # replaces a Python-level unique/dropna/sort pass over the values
+    categories = values.cat.remove_unused_categories().cat.categories
+    return categories[categories != ''].tolist()
+
 # Smart filter function - updates available options based on current selections
-def get_filtered_options(selected_filters, base_metadata):
+@st.cache_data
+def get_filtered_options(selected_filters, _base_metadata):
     """Get available options for each filter based on current selections - cell type remains independent"""
     
+    # Build one read-only boolean mask per active filter instead of re-filtering a copy per option list
+    masks = {}
+    if not _base_metadata.empty:
+        for filter_name, column in FILTER_COLUMNS.items():
+            filter_value = selected_filters.get(filter_name, 'All')
+            if filter_value != 'All':
+                masks[filter_name] = (_base_metadata[column] == filter_value).to_numpy()
+    
     # For each filter, determine what should be available based on OTHER selected filters
     def get_options_for_filter(exclude_filter):
-        current_metadata = base_metadata.copy()
+        if _base_metadata.empty:
+            return []
         
-        # Apply all filters EXCEPT the one we're calculating options for
-        for filter_name, filter_value in selected_filters.items():
-            if filter_name == exclude_filter or filter_name == 'cell_type':  # Skip cell type and target filter
-                continue
-            if filter_value != 'All':
-                if filter_name == 'enhancer':
-                    current_metadata = current_metadata[current_metadata['enhancer_id'] == filter_value]
-                elif filter_name == 'cargo':
-                    current_metadata = current_metadata[current_metadata['cargo'] == filter_value]
-                elif filter_name == 'experiment':
-                    current_metadata = current_metadata[current_metadata['experiment'] == filter_value]
-                elif filter_name == 'gene':
-                    current_metadata = current_metadata[current_metadata['proximal_gene'] == filter_value]
-                elif filter_name == 'gc_delivered':
-                    current_metadata = current_metadata[current_metadata['GC delivered'] == filter_value]
+        values = _base_metadata[FILTER_COLUMNS[exclude_filter]]
+        other_masks = [mask for filter_name, mask in masks.items() if filter_name != exclude_filter]
+        if other_masks:
+            values = values[np.logical_and.reduce(other_masks)]
         
-        return current_metadata
+        return _options(values)
     
     # Get available options for each filter
-    enhancer_metadata = get_options_for_filter('enhancer')
-    available_enhancers = sorted(enhancer_metadata['enhancer_id'].unique()) if not enhancer_metadata.empty else []
-    
-    cargo_metadata = get_options_for_filter('cargo')
-    available_cargos = sorted([x for x in cargo_metadata['cargo'].dropna().unique() if x != '']) if not cargo_metadata.empty else []
-    
-    experiment_metadata = get_options_for_filter('experiment')
-    available_experiments = sorted([x for x in experiment_metadata['experiment'].dropna().unique() if x != '']) if not experiment_metadata.empty else []
-    
-    gene_metadata = get_options_for_filter('gene')
-    available_genes = sorted([x for x in gene_metadata['proximal_gene'].dropna().unique() if x != '']) if not gene_metadata.empty else []
-    
-    gc_metadata = get_options_for_filter('gc_delivered')
-    available_gc_delivered = sorted([x for x in gc_metadata['GC delivered'].dropna().unique() if x != '']) if not gc_metadata.empty else []
+    available_enhancers = get_options_for_filter('enhancer')
+    available_cargos = get_options_for_filter('cargo')
+    available_experiments = get_options_for_filter('experiment')
+    available_genes = get_options_for_filter('gene')
+    available_gc_delivered = get_options_for_filter('gc_delivered')
     
     # Cell type stays independent - always show all cell types
     available_cell_types = base_cell_types
@@ -131,74 +192,57 @@ def get_filtered_options(selected_filters, base_metadata):
         'cell_types': available_cell_types
     }
 
-# Get current filter options
-current_options = get_filtered_options(st.session_state.filter_state, base_metadata)
-
-# Sidebar filter controls with smart filtering
-selected_enhancer = st.sidebar.selectbox(
-    "Select Enhancer",
-    options=["All"] + current_options['enhancers'],
-    index=0 if st.session_state.filter_state['enhancer'] == 'All' or st.session_state.filter_state['enhancer'] not in current_options['enhancers'] else current_options['enhancers'].index(st.session_state.filter_state['enhancer']) + 1,
-    help="Choose a specific enhancer to analyze"
-)
-
-selected_cargo = st.sidebar.selectbox(
-    "Filter by Cargo",
-    options=["All"] + current_options['cargos'],
-    index=0 if st.session_state.filter_state['cargo'] == 'All' or st.session_state.filter_state['cargo'] not in current_options['cargos'] else current_options['cargos'].index(st.session_state.filter_state['cargo']) + 1,
-    help="Filter by experimental cargo type"
-)
+# Get current filter options - cell type is independent, so only the other filters key the
+# option lists and toggling cell type reuses the options computed on the previous rerun
+option_filter_state = {name: value for name, value in st.session_state.filter_state.items() if name != 'cell_type'}
+if 'current_options' not in st.session_state or st.session_state.get('option_filter_state') != option_filter_state:
+    st.session_state.current_options = get_filtered_options(option_filter_state, base_metadata)
+    st.session_state.option_filter_state = option_filter_state
+current_options = st.session_state.current_options
 
-selected_experiment = st.sidebar.selectbox(
-    "Filter by Experiment", 
-    options=["All"] + current_options['experiments'],
-    index=0 if st.session_state.filter_state['experiment'] == 'All' or st.session_state.filter_state['experiment'] not in current_options['experiments'] else current_options['experiments'].index(st.session_state.filter_state['experiment']) + 1,
-    help="Filter by experiment identifier"
-)
+# Sidebar filter controls with smart filtering: (label, filter state key, options key, help)
+SIDEBAR_FILTERS = [
+    ("Select Enhancer", 'enhancer', 'enhancers', "Choose a specific enhancer to analyze"),
+    ("Filter by Cargo", 'cargo', 'cargos', "Filter by experimental cargo type"),
+    ("Filter by Experiment", 'experiment', 'experiments', "Filter by experiment identifier"),
+    ("Filter by Proximal Gene", 'gene', 'genes', "Filter by nearest gene"),
+    ("Filter by GC Delivered", 'gc_delivered', 'gc_delivered', "Filter by genome copies delivered"),
+    ("Filter by Cell Type", 'cell_type', 'cell_types', "Filter by cell type for accessibility tracks")
+]
 
-selected_gene = st.sidebar.selectbox(
-    "Filter by Proximal Gene",
-    options=["All"] + current_options['genes'],
-    index=0 if st.session_state.filter_state['gene'] == 'All' or st.session_state.filter_state['gene'] not in current_options['genes'] else current_options['genes'].index(st.session_state.filter_state['gene']) + 1,
-    help="Filter by nearest gene"
-)
+# Selectbox position of every option (offset by the leading "All") for O(1) index lookups
+option_indices = {key: {option: i + 1 for i, option in enumerate(options)} for key, options in current_options.items()}
 
-selected_gc_delivered = st.sidebar.selectbox(
-    "Filter by GC Delivered",
-    options=["All"] + current_options['gc_delivered'],
-    index=0 if st.session_state.filter_state['gc_delivered'] == 'All' or st.session_state.filter_state['gc_delivered'] not in current_options['gc_delivered'] else current_options['gc_delivered'].index(st.session_state.filter_state['gc_delivered']) + 1,
-    help="Filter by genome copies delivered"
-)
+selections = {}
+for label, state_key, options_key, help_text in SIDEBAR_FILTERS:
+    selections[state_key] = st.sidebar.selectbox(
+        label,
+        options=["All"] + current_options[options_key],
+        index=option_indices[options_key].get(st.session_state.filter_state[state_key], 0),
+        help=help_text
+    )
 
-selected_cell_type = st.sidebar.selectbox(
-    "Filter by Cell Type",
-    options=["All"] + current_options['cell_types'],
-    index=0 if st.session_state.filter_state['cell_type'] == 'All' or st.session_state.filter_state['cell_type'] not in current_options['cell_types'] else current_options['cell_types'].index(st.session_state.filter_state['cell_type']) + 1,
-    help="Filter by cell type for accessibility tracks"
-)
+selected_enhancer = selections['enhancer']
+selected_cargo = selections['cargo']
+selected_experiment = selections['experiment']
+selected_gene = selections['gene']
+selected_gc_delivered = selections['gc_delivered']
+selected_cell_type = selections['cell_type']
 
 # Update session state
-st.session_state.filter_state = {
-    'enhancer': selected_enhancer,
-    'cargo': selected_cargo,
-    'experiment': selected_experiment,
-    'gene': selected_gene,
-    'gc_delivered': selected_gc_delivered,
-    'cell_type': selected_cell_type
-}
+st.session_state.filter_state = selections
 
 # Initialize filtered_enhancers and relevant_metadata
 filtered_enhancers = pd.DataFrame()
 relevant_metadata = pd.DataFrame()
 
 # Apply metadata filters only if data is available
-print(f"DEBUG - Checking HOF enhancers: {hof_enhancers is not None}, {not hof_enhancers.empty if hof_enhancers is not None else 'N/A'}")
 if hof_enhancers is not None and not hof_enhancers.empty:
-    enhancer_ids_to_include = set(hof_enhancers['enhancer_id'].unique())
+    enhancer_ids_to_include = _hof_enhancer_ids(hof_enhancers)
     
     if enhancer_metadata is not None and not enhancer_metadata.empty:
         if any(filter_val != "All" for filter_val in [selected_cargo, selected_experiment, selected_gene, selected_gc_delivered]):
-            filtered_metadata = enhancer_metadata.copy()
+            filtered_metadata = enhancer_metadata
             
             if selected_cargo != "All":
                 filtered_metadata = filtered_metadata[filtered_metadata['cargo'] == selected_cargo]
@@ -212,20 +256,85 @@ if hof_enhancers is not None and not hof_enhancers.empty:
             if selected_gc_delivered != "All":
                 filtered_metadata = filtered_metadata[filtered_metadata['GC delivered'] == selected_gc_delivered]
             
-            # Get the enhancer IDs that match the metadata filters
-            matching_enhancer_ids = set(filtered_metadata['enhancer_id'].unique())
+            # Get the enhancer IDs that match the metadata filters - pd.Index set ops stay in C
+            matching_enhancer_ids = pd.Index(filtered_metadata['enhancer_id'].unique())
             enhancer_ids_to_include = enhancer_ids_to_include.intersection(matching_enhancer_ids)
         
-        # Filter HOF enhancers to only include those that pass metadata filters - ONE record per enhancer
-        filtered_enhancers = hof_enhancers[hof_enhancers['enhancer_id'].isin(list(enhancer_ids_to_include))].drop_duplicates(subset=['enhancer_id'], keep='first').copy()
-        relevant_metadata = enhancer_metadata[enhancer_metadata['enhancer_id'].isin(list(enhancer_ids_to_include))]
+        # Filter HOF enhancers to only include those that pass metadata filters - already ONE record per enhancer
+        filtered_enhancers = hof_enhancers[hof_enhancers['enhancer_id'].isin(enhancer_ids_to_include)]
+        relevant_metadata = enhancer_metadata[enhancer_metadata['enhancer_id'].isin(enhancer_ids_to_include)]
     else:
         # No metadata available, use all HOF enhancers
-        filtered_enhancers = hof_enhancers.drop_duplicates(subset=['enhancer_id'], keep='first').copy()
+        filtered_enhancers = hof_enhancers
 else:
     # No HOF enhancers available
     st.error("No Hall of Fame enhancers data available. Please check data files.")
 
+# Summary table for the "All" view - one merge/groupby instead of a per-enhancer metadata scan
+SUMMARY_METADATA_COLUMNS = ['Cargo', 'Experiment', 'Gene', 'GC Delivered']
+
+def build_enhancer_summary(filtered_enhancers, relevant_metadata):
+    """Build the Available Enhancers table with vectorized pandas operations"""
+    summary = filtered_enhancers[['enhancer_id', 'chr', 'start', 'end']].copy()
+    summary['enhancer_id'] = summary['enhancer_id'].astype(object)
+    
+    if not relevant_metadata.empty and 'enhancer_id' in relevant_metadata.columns:
+        meta_agg = relevant_metadata.groupby('enhancer_id', observed=True).agg(
+            **{
+                'Cargo': ('cargo', 'first'),
+                'Experiment': ('experiment', 'first'),
+                'Gene': ('proximal_gene', 'first'),
+                'GC Delivered': ('GC delivered', 'first'),
+                'Experiments': ('experiment', 'nunique')
+            }
+        ).reset_index()
+        meta_agg['enhancer_id'] = meta_agg['enhancer_id'].astype(object)
+        summary = summary.merge(meta_agg, on='enhancer_id', how='left')
+    else:
+        summary = summary.assign(**{column: np.nan for column in SUMMARY_METADATA_COLUMNS + ['Experiments']})
+    
+    summary[SUMMARY_METADATA_COLUMNS] = summary[SUMMARY_METADATA_COLUMNS].astype(object).fillna('N/A')
+    summary['Experiments'] = summary['Experiments'].fillna(0).astype(int)
+    
+    # start/end are downcast integer columns, so these stay vectorized numpy/string ops
+    summary['Location'] = summary['chr'].astype(str) + ':' + summary['start'].astype(str) + '-' + summary['end'].astype(str)
+    summary['Length (bp)'] = summary['end'] - summary['start']
+    
+    return summary.rename(columns={'enhancer_id': 'Enhancer'})[
+        ['Enhancer', 'Location', 'Length (bp)'] + SUMMARY_METADATA_COLUMNS + ['Experiments']
+    ]
+
+# Header shown above the detail view of a selected enhancer
+ENHANCER_HEADER_TEMPLATE = (
+    '<div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 10px; margin-bottom: 20px;">'
+    '<h2 style="color: white; margin: 0; font-size: 24px;">{enhancer_id}</h2>'
+    '<p style="color: white; margin: 5px 0; font-size: 16px;"><strong>Location:</strong> {location}</p>'
+    '<p style="color: white; margin: 5px 0; font-size: 16px;"><strong>Cargo:</strong> {cargo} | <strong>Experiment:</strong> {experiment} | <strong>Gene:</strong> {gene}</p>'
+    '</div>'
+)
+
+# Imaging section order per experiment type - lightsheet prioritizes Neuroglancer viewers and
+# MIP projections, EPI prioritizes contact sheets, anything else shows all imaging in default order
+IMAGING_SECTION_ORDER = {
+    'LIGHTSHEET': ['viewers', 'mips', 'sheets'],
+    'EPI': ['sheets', 'viewers', 'mips']
+}
+DEFAULT_IMAGING_SECTION_ORDER = ['sheets', 'viewers', 'mips']
+
+# Each image/viewer sits in its own expander with only the first one of a section open,
+# so the browser does not mount every iframe and fetch every image on first paint
+def _render_viewer(i, url):
+    with st.expander(f"Viewer {i}", expanded=(i == 1)):
+        st.components.v1.iframe(url, height=600)
+
+def _render_mip(i, url):
+    with st.expander(f"MIP Projection {i}", expanded=(i == 1)):
+        st.image(url, use_column_width=True)
+
+def _render_contact_sheet(i, url):
+    with st.expander(f"Contact Sheet {i}", expanded=(i == 1)):
+        st.image(url, use_column_width=True)
+
 # Display results
 if filtered_enhancers.empty:
     st.warning("⚠️ No enhancers match the selected filters. Please adjust your filter criteria.")
@@ -235,43 +344,9 @@ elif selected_enhancer == "All":
     
     # Show summary table of all enhancers
     if not filtered_enhancers.empty:
-        # Get basic info for display
-        display_data = []
-        for _, row in filtered_enhancers.iterrows():
-            enhancer_id = row['enhancer_id']
-            chr_info = row['chr']
-            start_pos = int(row['start'])
-            end_pos = int(row['end'])
-            length = end_pos - start_pos
-            
-            # Get metadata if available
-            enhancer_meta = relevant_metadata[relevant_metadata['enhancer_id'] == enhancer_id] if not relevant_metadata.empty and 'enhancer_id' in relevant_metadata.columns else pd.DataFrame()
-            if not enhancer_meta.empty:
-                cargo = enhancer_meta.iloc[0]['cargo']
-                experiment = enhancer_meta.iloc[0]['experiment']
-                gene = enhancer_meta.iloc[0]['proximal_gene']
-                gc_delivered = enhancer_meta.iloc[0]['GC delivered']
-                unique_experiments = enhancer_meta['experiment'].nunique()
-            else:
-                cargo = "N/A"
-                experiment = "N/A"
-                gene = "N/A"
-                gc_delivered = "N/A"
-                unique_experiments = 0
-            
-            display_data.append({
-                'Enhancer': enhancer_id,
-                'Location': f"{chr_info}:{start_pos}-{end_pos}",
-                'Length (bp)': length,
-                'Cargo': cargo,
-                'Experiment': experiment,
-                'Gene': gene,
-                'GC Delivered': gc_delivered,
-                'Experiments': unique_experiments
-            })
+        summary_df = build_enhancer_summary(filtered_enhancers, relevant_metadata)
         
         # Display as DataFrame
-        summary_df = pd.DataFrame(display_data)
         st.dataframe(summary_df, use_container_width=True)
         
         st.markdown(f"**Total enhancers:** {len(filtered_enhancers)}")
@@ -281,180 +356,84 @@ else:
     selected_row = filtered_enhancers[filtered_enhancers['enhancer_id'] == selected_enhancer]
     
     if not selected_row.empty:
-        enhancer_row = selected_row.iloc[0]
-        enhancer_id = enhancer_row['enhancer_id']
-        chr_info = enhancer_row['chr']
-        start_pos = int(enhancer_row['start'])
-        end_pos = int(enhancer_row['end'])
+        # One namedtuple for the row instead of a pandas lookup per field
+        enhancer_row = next(selected_row.itertuples(index=False))
+        enhancer_id = enhancer_row.enhancer_id
+        chr_info = enhancer_row.chr
+        start_pos = int(enhancer_row.start)
+        end_pos = int(enhancer_row.end)
         length = end_pos - start_pos
         
-        # Get metadata for this enhancer
-        enhancer_meta = relevant_metadata[relevant_metadata['enhancer_id'] == enhancer_id] if not relevant_metadata.empty and 'enhancer_id' in relevant_metadata.columns else pd.DataFrame()
+        # Get metadata for this enhancer - it passed the metadata filters, so all of its rows are relevant
+        enhancer_meta = _metadata_by_enhancer(enhancer_metadata).get(enhancer_id, pd.DataFrame()) if not relevant_metadata.empty else pd.DataFrame()
         
         if not enhancer_meta.empty:
-            cargo = enhancer_meta.iloc[0]['cargo']
-            experiment = enhancer_meta.iloc[0]['experiment']
-            gene = enhancer_meta.iloc[0]['proximal_gene']
+            first_meta = enhancer_meta.iloc[0].to_dict()
+            cargo = first_meta['cargo']
+            experiment = first_meta['experiment']
+            gene = first_meta['proximal_gene']
             
-            # Enhanced header with metadata
-            st.markdown(f'<div style="background: linear-gradient(90deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 10px; margin-bottom: 20px;">', unsafe_allow_html=True)
-            st.markdown(f'<h2 style="color: white; margin: 0; font-size: 24px;">{enhancer_id}</h2>', unsafe_allow_html=True)
-            st.markdown(f'<p style="color: white; margin: 5px 0; font-size: 16px;"><strong>Location:</strong> {chr_info}:{start_pos:,}-{end_pos:,} ({length:,} bp)</p>', unsafe_allow_html=True)
-            st.markdown(f'<p style="color: white; margin: 5px 0; font-size: 16px;"><strong>Cargo:</strong> {cargo} | <strong>Experiment:</strong> {experiment} | <strong>Gene:</strong> {gene}</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            # Enhanced header with metadata - one message instead of one per HTML fragment
+            st.markdown(ENHANCER_HEADER_TEMPLATE.format(
+                enhancer_id=enhancer_id,
+                location=f"{chr_info}:{start_pos:,}-{end_pos:,} ({length:,} bp)",
+                cargo=cargo,
+                experiment=experiment,
+                gene=gene
+            ), unsafe_allow_html=True)
             
-            # Get all imaging data for this enhancer from the metadata dataframe
+            # Get all imaging data for this enhancer from its metadata rows
             if not relevant_metadata.empty:
                 # Get the metadata row for this specific enhancer, experiment type, and GC delivered
-                if 'enhancer_id' in relevant_metadata.columns and 'experiment' in relevant_metadata.columns:
-                    enhancer_meta_row = relevant_metadata[
-                        (relevant_metadata['enhancer_id'] == enhancer_id) & 
-                        (relevant_metadata['experiment'] == selected_experiment)
-                    ]
+                if 'experiment' in enhancer_meta.columns:
+                    enhancer_meta_row = enhancer_meta[enhancer_meta['experiment'] == selected_experiment]
                     
                     # If GC delivered filter is set, apply it too
-                    if selected_gc_delivered != "All" and 'GC delivered' in relevant_metadata.columns:
+                    if selected_gc_delivered != "All" and 'GC delivered' in enhancer_meta.columns:
                         enhancer_meta_row = enhancer_meta_row[
                             enhancer_meta_row['GC delivered'] == selected_gc_delivered
                         ]
                     
                     # If no exact match, use fallback (any experiment, any GC delivered)
                     if enhancer_meta_row.empty:
-                        enhancer_meta_row = relevant_metadata[relevant_metadata['enhancer_id'] == enhancer_id]
+                        enhancer_meta_row = enhancer_meta
                 else:
                     enhancer_meta_row = pd.DataFrame()
                 
                 if not enhancer_meta_row.empty:
-                    # Use the first matching record
-                    meta_row = enhancer_meta_row.iloc[0]
+                    # Use the first matching record, as a plain dict for the field lookups below
+                    meta_row = enhancer_meta_row.iloc[0].to_dict()
                     
                     # Display imaging if available
                     st.markdown("### 📸 Imaging Data")
                     
-                    # Get the imaging URLs from the metadata
-                    image_link = meta_row.get('image_link', '')
-                    neuroglancer_1 = meta_row.get('neuroglancer_1', '')
-                    neuroglancer_3 = meta_row.get('neuroglancer_3', '')
-                    viewer_link = meta_row.get('viewer_link', '')
-                    coronal_mip = meta_row.get('coronal_mip', '')
-                    sagittal_mip = meta_row.get('sagittal_mip', '')
-                    
-                    # Initialize viewer components
-                    viewer_components = []
-                    contact_sheets = []
-                    
-                    # Process image_link (contact sheets)
-                    if image_link and image_link != 'FALSE' and pd.notna(image_link):
-                        if ',' in str(image_link):
-                            contact_sheets.extend([url.strip() for url in str(image_link).split(',')])
-                        else:
-                            contact_sheets.append(str(image_link).strip())
-                    
-                    # Process neuroglancer viewers
-                    if neuroglancer_1 and neuroglancer_1 != 'FALSE' and pd.notna(neuroglancer_1):
-                        if ',' in str(neuroglancer_1):
-                            viewer_components.extend([url.strip() for url in str(neuroglancer_1).split(',')])
-                        else:
-                            viewer_components.append(str(neuroglancer_1).strip())
-                    
-                    if neuroglancer_3 and neuroglancer_3 != 'FALSE' and pd.notna(neuroglancer_3):
-                        if ',' in str(neuroglancer_3):
-                            viewer_components.extend([url.strip() for url in str(neuroglancer_3).split(',')])
-                        else:
-                            viewer_components.append(str(neuroglancer_3).strip())
-                    
-                    # Process viewer_link
-                    if viewer_link and viewer_link != 'FALSE' and pd.notna(viewer_link):
-                        if ',' in str(viewer_link):
-                            viewer_components.extend([url.strip() for url in str(viewer_link).split(',')])
-                        else:
-                            viewer_components.append(str(viewer_link).strip())
-                    
-                    # Process MIP projections
-                    mip_projections = []
-                    if coronal_mip and coronal_mip != 'FALSE' and pd.notna(coronal_mip):
-                        if ',' in str(coronal_mip):
-                            mip_projections.extend([url.strip() for url in str(coronal_mip).split(',')])
-                        else:
-                            mip_projections.append(str(coronal_mip).strip())
-                    
-                    if sagittal_mip and sagittal_mip != 'FALSE' and pd.notna(sagittal_mip):
-                        if ',' in str(sagittal_mip):
-                            mip_projections.extend([url.strip() for url in str(sagittal_mip).split(',')])
-                        else:
-                            mip_projections.append(str(sagittal_mip).strip())
+                    # Imaging URLs were split into lists once at load time - 'FALSE', blank and
+                    # missing links are already dropped, so an empty list means no imaging
+                    contact_sheets = list(meta_row.get('image_link_list', []))
+                    viewer_components = [
+                        *meta_row.get('neuroglancer_1_list', []),
+                        *meta_row.get('neuroglancer_3_list', []),
+                        *meta_row.get('viewer_link_list', [])
+                    ]
+                    mip_projections = [
+                        *meta_row.get('coronal_mip_list', []),
+                        *meta_row.get('sagittal_mip_list', [])
+                    ]
                     
                     # Display imaging based on experiment type
                     experiment_type = meta_row.get('experiment', '').upper()
+                    imaging_sections = {
+                        'viewers': ("#### 🧠 Neuroglancer Viewers", viewer_components, _render_viewer),
+                        'mips': ("#### 📊 MIP Projections", mip_projections, _render_mip),
+                        'sheets': ("#### 📷 Contact Sheets", contact_sheets, _render_contact_sheet)
+                    }
                     
-                    if experiment_type == 'LIGHTSHEET':
-                        # For lightsheet: prioritize Neuroglancer viewers and MIP projections
-                        if viewer_components:
-                            st.markdown("#### 🧠 Neuroglancer Viewers")
-                            for i, viewer_url in enumerate(viewer_components):
-                                if viewer_url:
-                                    st.markdown(f"**Viewer {i+1}:**")
-                                    st.components.v1.iframe(viewer_url, height=600)
-                        
-                        if mip_projections:
-                            st.markdown("#### 📊 MIP Projections")
-                            for i, mip_url in enumerate(mip_projections):
-                                if mip_url:
-                                    st.markdown(f"**MIP Projection {i+1}:**")
-                                    st.image(mip_url, use_column_width=True)
-                        
-                        if contact_sheets:
-                            st.markdown("#### 📷 Contact Sheets")
-                            for i, sheet_url in enumerate(contact_sheets):
-                                if sheet_url:
-                                    st.markdown(f"**Contact Sheet {i+1}:**")
-                                    st.image(sheet_url, use_column_width=True)
-                                    
-                    elif experiment_type == 'EPI':
-                        # For EPI: prioritize contact sheets first, then Neuroglancer
-                        if contact_sheets:
-                            st.markdown("#### 📷 Contact Sheets")
-                            for i, sheet_url in enumerate(contact_sheets):
-                                if sheet_url:
-                                    st.markdown(f"**Contact Sheet {i+1}:**")
-                                    st.image(sheet_url, use_column_width=True)
-                        
-                        if viewer_components:
-                            st.markdown("#### 🧠 Neuroglancer Viewers")
-                            for i, viewer_url in enumerate(viewer_components):
-                                if viewer_url:
-                                    st.markdown(f"**Viewer {i+1}:**")
-                                    st.components.v1.iframe(viewer_url, height=600)
-                        
-                        if mip_projections:
-                            st.markdown("#### 📊 MIP Projections")
-                            for i, mip_url in enumerate(mip_projections):
-                                if mip_url:
-                                    st.markdown(f"**MIP Projection {i+1}:**")
-                                    st.image(mip_url, use_column_width=True)
-                    
-                    else:
-                        # Default: show all available imaging
-                        if contact_sheets:
-                            st.markdown("#### 📷 Contact Sheets")
-                            for i, sheet_url in enumerate(contact_sheets):
-                                if sheet_url:
-                                    st.markdown(f"**Contact Sheet {i+1}:**")
-                                    st.image(sheet_url, use_column_width=True)
-                        
-                        if viewer_components:
-                            st.markdown("#### 🧠 Neuroglancer Viewers")
-                            for i, viewer_url in enumerate(viewer_components):
-                                if viewer_url:
-                                    st.markdown(f"**Viewer {i+1}:**")
-                                    st.components.v1.iframe(viewer_url, height=600)
-                        
-                        if mip_projections:
-                            st.markdown("#### 📊 MIP Projections")
-                            for i, mip_url in enumerate(mip_projections):
-                                if mip_url:
-                                    st.markdown(f"**MIP Projection {i+1}:**")
-                                    st.image(mip_url, use_column_width=True)
+                    for section in IMAGING_SECTION_ORDER.get(experiment_type, DEFAULT_IMAGING_SECTION_ORDER):
+                        title, urls, render = imaging_sections[section]
+                        if urls:
+                            st.markdown(title)
+                            for i, url in enumerate(urls, 1):
+                                render(i, url)
                     
                     # Show message if no imaging data available
                     if not any([contact_sheets, viewer_components, mip_projections]):
@@ -468,18 +447,27 @@ else:
         
         # Get peak data for selected enhancer
         if peak_data is not None and not peak_data.empty:
-            enhancer_peaks = peak_data[peak_data['enhancer_id'] == enhancer_id]
+            try:
+                enhancer_peaks = peak_data.loc[[enhancer_id]]
+            except KeyError:
+                enhancer_peaks = pd.DataFrame()
             
             if not enhancer_peaks.empty:
                 st.markdown("### 📊 Peak Accessibility Analysis")
                 
                 # Apply cell type filter if specified
                 if selected_cell_type != "All":
-                    enhancer_peaks = enhancer_peaks[enhancer_peaks['cell_type'] == selected_cell_type]
+                    try:
+                        enhancer_peaks = enhancer_peaks.loc[[(enhancer_id, selected_cell_type)]]
+                    except KeyError:
+                        enhancer_peaks = pd.DataFrame()
                 
                 if not enhancer_peaks.empty:
+                    # Visualizations expect enhancer_id and cell_type as regular columns
+                    enhancer_peaks = enhancer_peaks.reset_index()
+                    
                     # Generate visualization
-                    viz_generator = VisualizationGenerator()
+                    viz_generator = get_viz()
                     
                     if selected_cell_type == "All":
                         # Show all cell types
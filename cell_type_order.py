@@ -0,0 +1,13 @@
+"""
+Cell type ordering shared by the data loader, the app and the plots
+"""
+
+import re
+
+# Leading number of cell type names like "11_CNU_HYa_GABA" (1-34)
+CELL_TYPE_NUMBER_PATTERN = re.compile(r'^(\d+)')
+
+def cell_type_sort_key(cell_type):
+    """Sort key ordering cell types by their leading number; unnumbered types go last"""
+    match = CELL_TYPE_NUMBER_PATTERN.match(str(cell_type))
+    return int(match.group(1)) if match else 999
@@ -3,23 +3,102 @@ Data Processor for GitHub Deployment with Chunked CSV Files
 Handles loading and combining chunked CSV files automatically
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import os
 import glob
+import json
+import logging
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# Single columnar copy of all peak data chunks, written by prepare_for_github.py
+PEAK_DATA_PARQUET = "peak_data.parquet"
+
+# Source CSV chunks of the four peak data exports (part1 ... part4)
+PEAK_DATA_CHUNK_PATTERN = "part[1-4]*chunk*.csv"
+
+# Enhancer and experiment metadata export, including the Hall_of_fame flags
+METADATA_FEATHER = "Enhancer_and_experiment_metadata_1751579195077.feather"
+
+# HOF_DEDUP values that turn on duplicate peak row removal; anything else, including 0, leaves it off
+HOF_DEDUP_ENABLED_VALUES = ('1', 'true', 'yes', 'on')
+
+# Low-cardinality labels repeated on every peak row - dictionary encoded so pandas
+# holds them as category codes instead of millions of Python strings
+PEAK_DATA_DICTIONARY_COLUMNS = ['cell_type', 'enhancer_id', 'chr', 'region_type']
+
+# Declared CSV column types so every chunk parses identically without per-file inference;
+# genomic coordinates fit comfortably in int32. Columns absent from a chunk are ignored.
+PEAK_DATA_COLUMN_TYPES = {
+    **{col: pa.dictionary(pa.int32(), pa.string()) for col in PEAK_DATA_DICTIONARY_COLUMNS},
+    'genomic_position': pa.int32(),
+    'distance_from_enhancer': pa.int32(),
+    'enhancer_start': pa.int32(),
+    'enhancer_end': pa.int32(),
+    'extended_start': pa.int32(),
+    'extended_end': pa.int32(),
+    'start': pa.int32(),
+    'end': pa.int32(),
+    'position_index': pa.int32(),
+    'signal_value': pa.float32(),
+    'accessibility_score': pa.float32()
+}
+
+# Imaging link columns - each gets a pre-split "<column>_list" column at load time
+IMAGING_LINK_COLUMNS = ['image_link', 'neuroglancer_1', 'neuroglancer_3', 'viewer_link', 'coronal_mip', 'sagittal_mip']
+
+# Processed outputs are persisted as uncompressed Feather (Arrow IPC) after the first
+# successful load so cold starts memory-map them instead of re-parsing every CSV chunk
+PROCESSED_DATA_FILES = {
+    'peak_data': 'processed_peak_data.feather',
+    'enhancer_metadata': 'processed_enhancer_metadata.feather',
+    'hof_enhancers': 'processed_hof_enhancers.feather'
+}
+
+# Columns kept in the processed data - load_all_data returns only these on both the source and
+# the processed path. Peak data keeps every column of the peak export, plus the
+# start/end/position_index/accessibility_score columns visualization.py plots when an export
+# provides them; metadata keeps the normalized link columns next to their pre-split lists
+PROCESSED_DATA_COLUMNS = {
+    'peak_data': ['cell_type', 'enhancer_id', 'chr', 'genomic_position', 'signal_value', 'region_type',
+                  'distance_from_enhancer', 'enhancer_start', 'enhancer_end', 'extended_start', 'extended_end',
+                  'start', 'end', 'position_index', 'accessibility_score'],
+    'enhancer_metadata': ['enhancer_id', 'Hall_of_fame', 'cargo', 'experiment', 'proximal_gene', 'GC delivered'] +
+                         IMAGING_LINK_COLUMNS + [f"{col}_list" for col in IMAGING_LINK_COLUMNS],
+    'hof_enhancers': ['enhancer_id', 'chr', 'start', 'end', 'cargo', 'experiment', 'proximal_gene', 'GC delivered']
+}
+
+# Bump whenever the processed frames change shape so files written by older code are rebuilt
+PROCESSED_DATA_VERSION = "5"
+
+# Schema metadata keys stamped on every processed file: the code version and the
+# name/mtime/size of the source files the processed data was built from
+PROCESSED_VERSION_KEY = b'hof_processed_version'
+PROCESSED_SOURCES_KEY = b'hof_source_fingerprint'
+
 class DataProcessor:
     """Process and load genomic data from chunked CSV files and metadata"""
     
-    def __init__(self):
+    def __init__(self, base_path=None):
         # Get absolute path to current directory for Posit Cloud compatibility
-        self.base_path = os.path.dirname(os.path.abspath(__file__))
+        self.base_path = base_path or os.path.dirname(os.path.abspath(__file__))
         self.data_dir = self.base_path  # Use absolute path for all operations
-        print(f"DataProcessor initialized with base_path: {self.base_path}")
-        print(f"Available files: {[f for f in os.listdir(self.base_path) if f.endswith(('.csv', '.feather'))][:5]}...")
+        logger.debug("DataProcessor initialized with base_path: %s", self.base_path)
         
     def load_all_data(self):
         """Load and process all data files including chunked CSV files"""
+        # Use the processed Feather files when a previous run already produced them
+        processed = self.load_processed_data()
+        if processed is not None:
+            return processed
+        
         # Load peak data from chunked files
         peak_data = self.load_peak_data()
         
@@ -32,79 +111,189 @@ class DataProcessor:
         # Extract Hall of Fame enhancers
         hof_enhancers = self.extract_hof_enhancers(enhancer_metadata, peak_data)
         
-        print(f"=== FINAL VALIDATION ===")
-        print(f"Peak data: {len(peak_data) if peak_data is not None else 'None'}")
-        print(f"Metadata: {len(enhancer_metadata) if enhancer_metadata is not None else 'None'}")
-        print(f"HOF enhancers: {len(hof_enhancers) if hof_enhancers is not None else 'None'}")
+        logger.debug("=== FINAL VALIDATION ===")
+        logger.debug("Peak data: %s", len(peak_data) if peak_data is not None else 'None')
+        logger.debug("Metadata: %s", len(enhancer_metadata) if enhancer_metadata is not None else 'None')
+        logger.debug("HOF enhancers: %s", len(hof_enhancers) if hof_enhancers is not None else 'None')
         
         # Validate data integrity
         self.validate_data_integrity(peak_data, enhancer_metadata)
         
+        # Same columns as a load from the processed files, so every start sees identical frames
+        peak_data = self.select_processed_columns('peak_data', peak_data)
+        if enhancer_metadata is not None:
+            enhancer_metadata = self.select_processed_columns('enhancer_metadata', enhancer_metadata)
+        
+        # Persist processed outputs so the next cold start skips CSV parsing
+        if enhancer_metadata is not None and hof_enhancers is not None and not hof_enhancers.empty:
+            self.save_processed_data(peak_data, enhancer_metadata, hof_enhancers)
+        
         # CRITICAL: Return order must match app.py expectations
         return peak_data, enhancer_metadata, hof_enhancers
     
-    def load_peak_data(self):
-        """Load and combine chunked CSV files"""
-        print(f"Loading peak data from directory: {self.data_dir}")
+    def load_processed_data(self):
+        """Memory-map processed data from Feather, converting only the columns the app uses"""
+        paths = {name: os.path.join(self.base_path, filename) for name, filename in PROCESSED_DATA_FILES.items()}
+        if not all(os.path.exists(path) for path in paths.values()):
+            return None
+        
         try:
-            # Pattern to match all chunk files in current directory
-            chunk_patterns = [
-                "part1*chunk*.csv",
-                "part2*chunk*.csv", 
-                "part3*chunk*.csv",
-                "part4*chunk*.csv"
-            ]
-            
-            all_chunks = []
-            for pattern in chunk_patterns:
-                search_pattern = os.path.join(self.data_dir, pattern)
-                chunk_files = glob.glob(search_pattern)
-                chunk_files.sort()  # Ensure proper order
-                print(f"Pattern {pattern}: found {len(chunk_files)} files")
-                
-                if chunk_files:
-                    print(f"Loading {len(chunk_files)} chunks for pattern {pattern}")
-                    
-                    for chunk_file in chunk_files:
-                        df = pd.read_csv(chunk_file)
-                        all_chunks.append(df)
-                        print(f"  Loaded {os.path.basename(chunk_file)}: {len(df):,} rows")
+            fingerprint = self.source_fingerprint()
+            frames = {}
+            for name, path in paths.items():
+                table = feather.read_table(path, memory_map=True)
+                schema_metadata = table.schema.metadata or {}
+                if schema_metadata.get(PROCESSED_VERSION_KEY) != PROCESSED_DATA_VERSION.encode():
+                    logger.debug("%s was written by an older version, rebuilding processed data", os.path.basename(path))
+                    return None
+                if schema_metadata.get(PROCESSED_SOURCES_KEY) != fingerprint:
+                    logger.debug("Source files changed since %s was written, rebuilding processed data", os.path.basename(path))
+                    return None
+                columns = [col for col in table.column_names if col in PROCESSED_DATA_COLUMNS[name]]
+                table = table.select(columns)
+                # Arrow list columns convert to numpy arrays - read them back as the Python lists
+                # add_imaging_link_lists builds
+                list_columns = {field.name: table.column(field.name).to_pylist()
+                                for field in table.schema if pa.types.is_list(field.type)}
+                frames[name] = table.to_pandas(split_blocks=True, self_destruct=True)
+                for col, values in list_columns.items():
+                    frames[name][col] = pd.Series(values, index=frames[name].index, dtype=object)
+                logger.debug("Loaded %s: %d rows, %d columns", os.path.basename(path), len(frames[name]), len(columns))
             
-            if not all_chunks:
-                print("No chunk files found in current directory")
-                print("Expected files: part1*chunk*.csv, part2*chunk*.csv, part3*chunk*.csv, part4*chunk*.csv")
-                print("Current directory contents:")
-                for file in os.listdir("."):
-                    if file.endswith(".csv"):
-                        print(f"  {file}")
+            # CRITICAL: Return order must match app.py expectations
+            return frames['peak_data'], frames['enhancer_metadata'], frames['hof_enhancers']
+        except Exception as e:
+            logger.warning("Error loading processed data, falling back to source files: %s", e)
+            return None
+    
+    def select_processed_columns(self, name, df):
+        """Drop the columns of one processed frame that are not in PROCESSED_DATA_COLUMNS"""
+        dropped = [col for col in df.columns if col not in PROCESSED_DATA_COLUMNS[name]]
+        return df.drop(columns=dropped) if dropped else df
+    
+    def save_processed_data(self, peak_data, enhancer_metadata, hof_enhancers):
+        """Write processed data to uncompressed Feather files that can be memory-mapped"""
+        frames = {
+            'peak_data': peak_data,
+            'enhancer_metadata': enhancer_metadata,
+            'hof_enhancers': hof_enhancers
+        }
+        try:
+            fingerprint = self.source_fingerprint()
+            for name, df in frames.items():
+                path = os.path.join(self.base_path, PROCESSED_DATA_FILES[name])
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                table = table.replace_schema_metadata({
+                    **(table.schema.metadata or {}),
+                    PROCESSED_VERSION_KEY: PROCESSED_DATA_VERSION.encode(),
+                    PROCESSED_SOURCES_KEY: fingerprint
+                })
+                feather.write_feather(table, path, compression='uncompressed')
+                logger.debug("Saved %s: %d rows", os.path.basename(path), len(df))
+        except Exception as e:
+            # Read-only deployments simply keep loading from the source files
+            logger.warning("Could not save processed data: %s", e)
+    
+    def source_fingerprint(self):
+        """Name, mtime and size of every source file the processed data is built from"""
+        paths = sorted(glob.glob(os.path.join(self.data_dir, PEAK_DATA_CHUNK_PATTERN)))
+        paths += [os.path.join(self.data_dir, PEAK_DATA_PARQUET), os.path.join(self.base_path, METADATA_FEATHER)]
+        
+        sources = []
+        for path in paths:
+            if os.path.exists(path):
+                stat = os.stat(path)
+                sources.append([os.path.basename(path), stat.st_mtime_ns, stat.st_size])
+        return json.dumps(sources).encode()
+    
+    def load_peak_data(self):
+        """Load peak data from the combined Parquet file, falling back to the chunked CSV files"""
+        logger.debug("Loading peak data from directory: %s", self.data_dir)
+        
+        # One directory scan for all four parts; sorting keeps part1 ... part4 in chunk order
+        files = sorted(glob.glob(os.path.join(self.data_dir, PEAK_DATA_CHUNK_PATTERN)))
+        logger.debug("Pattern %s: found %d files", PEAK_DATA_CHUNK_PATTERN, len(files))
+        
+        parquet_path = os.path.join(self.data_dir, PEAK_DATA_PARQUET)
+        if os.path.exists(parquet_path):
+            # The Parquet file is generated from the chunks - ignore it once any chunk is newer
+            newest_chunk = max((os.path.getmtime(f) for f in files), default=0)
+            if newest_chunk > os.path.getmtime(parquet_path):
+                logger.warning("%s is older than the CSV chunks, loading the chunks instead", PEAK_DATA_PARQUET)
+            else:
+                try:
+                    # Same columns as the CSV path, without CSV tokenizing or type inference
+                    columns = pq.read_schema(parquet_path).names
+                    table = pq.read_table(
+                        parquet_path,
+                        read_dictionary=[col for col in PEAK_DATA_DICTIONARY_COLUMNS if col in columns]
+                    )
+                    # The Parquet file keeps the widths inferred at conversion time (int64/float64);
+                    # narrow them to the declared CSV types so both paths yield identical frames
+                    table = table.cast(pa.schema([
+                        pa.field(field.name, PEAK_DATA_COLUMN_TYPES.get(field.name, field.type))
+                        for field in table.schema
+                    ]))
+                    peak_data = table.to_pandas(self_destruct=True, split_blocks=True)
+                    logger.debug("Loaded %s: %d rows, %d columns", PEAK_DATA_PARQUET, len(peak_data), len(columns))
+                except Exception as e:
+                    logger.warning("Error loading %s, falling back to CSV chunks: %s", PEAK_DATA_PARQUET, e)
+                else:
+                    return self.drop_duplicate_peaks(peak_data)
+        
+        try:
+            if not files:
+                csv_files = [f for f in os.listdir(self.data_dir) if f.endswith(".csv")]
+                logger.error("No chunk files found in %s. Expected files: %s. CSV files present: %s",
+                             self.data_dir, PEAK_DATA_CHUNK_PATTERN, csv_files)
                 return None
             
-            # Combine all chunks
-            combined_df = pd.concat(all_chunks, ignore_index=True)
-            print(f"Combined all chunks: {len(combined_df):,} total rows")
-            
-            # Remove any duplicate rows
-            original_length = len(combined_df)
-            combined_df = combined_df.drop_duplicates()
-            if len(combined_df) < original_length:
-                print(f"Removed {original_length - len(combined_df):,} duplicate rows")
+            # One dataset scan parses the files in parallel and streams their record batches
+            # straight into a single table, so no per-chunk tables are held alongside it.
+            # 4 MB blocks split each chunk file so the scanner's readahead fetches the next
+            # blocks (and files) while the current ones are being parsed.
+            logger.debug("Loading %d chunks", len(files))
+            chunk_format = ds.CsvFileFormat(
+                read_options=pacsv.ReadOptions(block_size=4 << 20),
+                convert_options=pacsv.ConvertOptions(column_types=PEAK_DATA_COLUMN_TYPES)
+            )
+            scanner = ds.dataset(files, format=chunk_format).scanner(
+                use_threads=True, fragment_readahead=8, batch_readahead=16
+            )
+            combined_table = scanner.to_table()
+            combined_df = combined_table.to_pandas(self_destruct=True, split_blocks=True)
+            del combined_table
+            logger.debug("Combined all chunks: %d total rows", len(combined_df))
             
-            return combined_df
+            return self.drop_duplicate_peaks(combined_df)
             
         except Exception as e:
-            print(f"Error loading peak data: {str(e)}")
+            logger.error("Error loading peak data: %s", e)
             return None
     
+    def drop_duplicate_peaks(self, peak_data):
+        """Remove duplicate peak rows when HOF_DEDUP is enabled"""
+        # Chunks are disjoint slices of one export, so hashing every row for duplicates
+        # is only done on request (HOF_DEDUP=1) when debugging the source files
+        if os.environ.get("HOF_DEDUP", "").strip().lower() not in HOF_DEDUP_ENABLED_VALUES:
+            return peak_data
+        
+        original_length = len(peak_data)
+        peak_data = peak_data.drop_duplicates(ignore_index=True)
+        if len(peak_data) < original_length:
+            logger.debug("Removed %d duplicate rows", original_length - len(peak_data))
+        return peak_data
+    
     def load_metadata(self):
         """Load enhancer metadata from feather file"""
         try:
             # Use absolute path for Posit Cloud compatibility
-            metadata_path = os.path.join(self.base_path, "Enhancer_and_experiment_metadata_1751579195077.feather")
-            print(f"Looking for metadata at: {metadata_path}")
-            print(f"File exists: {os.path.exists(metadata_path)}")
+            metadata_path = os.path.join(self.base_path, METADATA_FEATHER)
+            logger.debug("Looking for metadata at: %s", metadata_path)
             if os.path.exists(metadata_path):
-                metadata = pd.read_feather(metadata_path)
-                print(f"Loaded metadata: {len(metadata)} records")
+                # Memory-map the Arrow file so renaming happens on the schema before any pandas conversion
+                metadata_table = feather.read_table(metadata_path, memory_map=True)
+                logger.debug("Loaded metadata: %d records", metadata_table.num_rows)
                 
                 # Fix column names to match expected format
                 column_mapping = {
@@ -121,25 +310,45 @@ class DataProcessor:
                 }
                 
                 # Rename columns that exist
-                existing_columns = {old_col: new_col for old_col, new_col in column_mapping.items() if old_col in metadata.columns}
-                metadata = metadata.rename(columns=existing_columns)
+                existing_columns = {old_col: new_col for old_col, new_col in column_mapping.items() if old_col in metadata_table.column_names}
+                metadata_table = metadata_table.rename_columns([column_mapping.get(col, col) for col in metadata_table.column_names])
+                metadata = metadata_table.to_pandas(split_blocks=True, self_destruct=True)
+                del metadata_table
+                
+                logger.debug("Renamed columns: %s", existing_columns)
+                logger.debug("Enhanced metadata columns: %s", list(metadata.columns))
                 
-                print(f"Renamed columns: {existing_columns}")
-                print(f"Enhanced metadata columns: {list(metadata.columns)}")
+                self.add_imaging_link_lists(metadata)
                 
                 return metadata
             else:
-                print(f"Metadata file not found at {metadata_path}")
-                print("Expected file: Enhancer_and_experiment_metadata_1751579195077.feather")
-                print("Current directory contents:")
-                for file in os.listdir("."):
-                    if file.endswith(".feather"):
-                        print(f"  {file}")
+                feather_files = [f for f in os.listdir(self.base_path) if f.endswith(".feather")]
+                logger.error("Metadata file not found at %s. Feather files present: %s", metadata_path, feather_files)
                 return None
         except Exception as e:
-            print(f"Error loading metadata: {str(e)}")
+            logger.error("Error loading metadata: %s", e)
             return None
     
+    def add_imaging_link_lists(self, metadata):
+        """Split comma-separated imaging URLs once into "<column>_list" columns"""
+        for col in IMAGING_LINK_COLUMNS:
+            if col not in metadata.columns:
+                metadata[f"{col}_list"] = [[] for _ in range(len(metadata))]
+                continue
+            
+            # 'FALSE' and blank values mean no imaging of that kind - normalize them to missing once,
+            # as None so the column matches what Arrow returns from the processed files
+            links = metadata[col]
+            links = links.where(links.isna(), links.astype(str).str.strip())
+            metadata[col] = links.where(~links.isin(['FALSE', '']), None)
+            
+            urls = metadata[col].dropna().astype(str).str.split(',').explode().str.strip()
+            urls = urls[urls != '']
+            urls_by_row = urls.groupby(level=0).agg(list).to_dict()
+            metadata[f"{col}_list"] = [urls_by_row.get(row, []) for row in metadata.index]
+        
+        return metadata
+    
     def extract_hof_enhancers(self, metadata_df, peak_data):
         """Extract the Hall of Fame enhancers and merge with metadata"""
         if peak_data is None or peak_data.empty:
@@ -147,62 +356,72 @@ class DataProcessor:
         
         # CRITICAL FIX: Get Hall of Fame enhancers from metadata first
         if metadata_df is None or metadata_df.empty:
-            print("No metadata available - cannot identify Hall of Fame enhancers")
+            logger.warning("No metadata available - cannot identify Hall of Fame enhancers")
             return pd.DataFrame()
         
         # Filter metadata for Hall of Fame enhancers (string 'TRUE', not boolean True)
         hof_metadata = metadata_df[metadata_df['Hall_of_fame'] == 'TRUE']
-        print(f"Found {len(hof_metadata)} Hall of Fame enhancer records in metadata")
+        logger.debug("Found %d Hall of Fame enhancer records in metadata", len(hof_metadata))
         
         if hof_metadata.empty:
-            print("No Hall of Fame enhancers found in metadata")
+            logger.warning("No Hall of Fame enhancers found in metadata")
             return pd.DataFrame()
         
         # Get unique HOF enhancer IDs from metadata
         hof_enhancer_ids = hof_metadata['enhancer_id'].unique()
-        print(f"Found {len(hof_enhancer_ids)} unique Hall of Fame enhancers: {hof_enhancer_ids[:5]}...")
+        logger.debug("Found %d unique Hall of Fame enhancers: %s...", len(hof_enhancer_ids), hof_enhancer_ids[:5])
         
         # Create base enhancer information more efficiently
-        print(f"Creating base enhancer records for {len(hof_enhancer_ids)} enhancers...")
-        
-        # Get first occurrence of each HOF enhancer from peak data
-        hof_peak_data = peak_data[peak_data['enhancer_id'].isin(hof_enhancer_ids)]
-        first_occurrences = hof_peak_data.groupby('enhancer_id').first().reset_index()
-        
-        # Create base enhancer records
-        hof_enhancers = []
-        for _, row in first_occurrences.iterrows():
-            enhancer_record = {
-                'enhancer_id': row['enhancer_id'],
-                'chr': row.get('chr', ''),
-                'start': row.get('start', 0),
-                'end': row.get('end', 0)
-            }
-            hof_enhancers.append(enhancer_record)
-        
-        hof_df = pd.DataFrame(hof_enhancers)
-        print(f"Created {len(hof_df)} base enhancer records")
+        logger.debug("Creating base enhancer records for %d enhancers...", len(hof_enhancer_ids))
+        
+        # Get first occurrence of each HOF enhancer from peak data, touching only the base columns
+        base_columns = [col for col in ['enhancer_id', 'chr', 'start', 'end'] if col in peak_data.columns]
+        peak_enhancer_ids = peak_data['enhancer_id']
+        if isinstance(peak_enhancer_ids.dtype, pd.CategoricalDtype):
+            # Membership test on the int category codes instead of hashing every id string; the
+            # codes also give each enhancer's first row position, so the HOF rows are never copied
+            codes = peak_enhancer_ids.cat.codes.to_numpy()
+            hof_codes = peak_enhancer_ids.cat.categories.get_indexer(hof_enhancer_ids)
+            hof_rows = np.flatnonzero(np.isin(codes, hof_codes[hof_codes >= 0]))
+            _, first_positions = np.unique(codes[hof_rows], return_index=True)
+            first_rows = np.sort(hof_rows[first_positions])
+            first_occurrences = peak_data.iloc[first_rows, peak_data.columns.get_indexer(base_columns)]
+        else:
+            hof_peak_data = peak_data.loc[peak_enhancer_ids.isin(hof_enhancer_ids), base_columns]
+            first_occurrences = hof_peak_data.drop_duplicates(subset='enhancer_id', keep='first')
+        
+        # Create base enhancer records - plain labels, since the peak categoricals carry
+        # every enhancer in the dataset as a category; sorted by ID like a groupby result
+        hof_df = (first_occurrences.reindex(columns=['enhancer_id', 'chr', 'start', 'end'])
+                  .astype({'enhancer_id': object, 'chr': object})
+                  .fillna({'chr': '', 'start': 0, 'end': 0})
+                  .sort_values('enhancer_id', ignore_index=True))
+        logger.debug("Created %d base enhancer records", len(hof_df))
         
         # Efficiently merge metadata using pandas merge
         if metadata_df is not None and not metadata_df.empty and not hof_df.empty:
-            print(f"Merging metadata for {len(hof_df)} enhancers...")
+            logger.debug("Merging metadata for %d enhancers...", len(hof_df))
             
-            # Create metadata summary for merge
-            metadata_for_merge = metadata_df.groupby('enhancer_id').first().reset_index()
+            # Create metadata summary for merge - project to the merged columns before aggregating
             metadata_cols = ['enhancer_id', 'cargo', 'experiment', 'proximal_gene', 'GC delivered']
-            available_cols = [col for col in metadata_cols if col in metadata_for_merge.columns]
+            available_cols = [col for col in metadata_cols if col in metadata_df.columns]
+            metadata_for_merge = metadata_df[available_cols].groupby('enhancer_id', observed=True).first()
             
-            # Merge using pandas - much more efficient than individual lookups
-            hof_df = hof_df.merge(metadata_for_merge[available_cols], on='enhancer_id', how='left')
+            # Left join on the summary's unique enhancer_id index - keeps hof_df's row order
+            # and skips the key hashing and duplicate handling of a column-on-column merge
+            hof_df = hof_df.join(metadata_for_merge, on='enhancer_id')
             
-            print(f"Merged {len(hof_df)} enhancers with metadata")
+            logger.debug("Merged %d enhancers with metadata", len(hof_df))
             
             # Quick validation
-            if 'cargo' in hof_df.columns:
+            if 'cargo' in hof_df.columns and logger.isEnabledFor(logging.DEBUG):
                 cargo_success = hof_df['cargo'].notna().sum()
-                print(f"Cargo merge success: {cargo_success}/{len(hof_df)} enhancers")
+                logger.debug("Cargo merge success: %d/%d enhancers", cargo_success, len(hof_df))
         
-        print(f"Successfully extracted {len(hof_df)} Hall of Fame enhancers with integrated metadata")
+        # Genomic coordinates fit in int32 - half the bytes of the int64 pandas infers
+        hof_df = hof_df.astype({col: 'int32' for col in ['start', 'end'] if col in hof_df.columns})
+        
+        logger.debug("Successfully extracted %d Hall of Fame enhancers with integrated metadata", len(hof_df))
         return hof_df
     
     def get_enhancer_summary(self, peak_data):
@@ -223,27 +442,36 @@ class DataProcessor:
     
     def validate_data_integrity(self, peak_data, metadata):
         """Validate data integrity and consistency"""
-        print("\n=== Data Validation ===")
+        # Report only - skip the unique counts entirely unless debug logging is on
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
+        logger.debug("=== Data Validation ===")
         
         if peak_data is not None and not peak_data.empty:
-            print(f"✓ Peak data loaded: {len(peak_data):,} rows")
-            print(f"✓ Unique enhancers: {peak_data['enhancer_id'].nunique()}")
+            logger.debug("✓ Peak data loaded: %d rows", len(peak_data))
+            logger.debug("✓ Unique enhancers: %d", peak_data['enhancer_id'].nunique())
             if 'cell_type' in peak_data.columns:
-                print(f"✓ Cell types: {peak_data['cell_type'].nunique()}")
+                logger.debug("✓ Cell types: %d", peak_data['cell_type'].nunique())
         else:
-            print("✗ Peak data missing or empty")
+            logger.debug("✗ Peak data missing or empty")
         
         if metadata is not None and not metadata.empty:
-            print(f"✓ Metadata loaded: {len(metadata):,} records")
-            print(f"✓ Unique enhancers in metadata: {metadata['enhancer_id'].nunique()}")
+            logger.debug("✓ Metadata loaded: %d records", len(metadata))
+            logger.debug("✓ Unique enhancers in metadata: %d", metadata['enhancer_id'].nunique())
         else:
-            print("✗ Metadata missing or empty")
+            logger.debug("✗ Metadata missing or empty")
         
         # Check for common enhancers
         if peak_data is not None and metadata is not None:
-            peak_enhancers = set(peak_data['enhancer_id'].unique())
-            meta_enhancers = set(metadata['enhancer_id'].unique())
-            common_enhancers = peak_enhancers.intersection(meta_enhancers)
-            print(f"✓ Common enhancers between datasets: {len(common_enhancers)}")
+            peak_ids = peak_data['enhancer_id']
+            # Categorical ids already hold the distinct labels - no pass over the peak rows needed
+            if isinstance(peak_ids.dtype, pd.CategoricalDtype):
+                peak_enhancers = np.asarray(peak_ids.cat.categories, dtype=object)
+            else:
+                peak_enhancers = peak_ids.dropna().unique()
+            meta_enhancers = metadata['enhancer_id'].dropna().unique()
+            common_enhancers = np.intersect1d(peak_enhancers, meta_enhancers, assume_unique=True)
+            logger.debug("✓ Common enhancers between datasets: %d", len(common_enhancers))
         
-        print("======================\n")
\ No newline at end of file
+        logger.debug("======================")
\ No newline at end of file
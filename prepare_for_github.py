@@ -3,11 +3,19 @@
 Prepare files for GitHub deployment by moving CSV chunks to main directory
 This script moves all CSV chunks from data_chunks/ to the main directory
 and the metadata feather file, making them ready for GitHub upload.
+It then regenerates peak_data.parquet from the chunks; run it with
+--parquet-only to skip the move step.
 """
 
 import os
-import shutil
+import sys
 import glob
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# Shared with the loader so the file written here is the file DataProcessor reads
+from data_processor_chunked import PEAK_DATA_CHUNK_PATTERN, PEAK_DATA_PARQUET
 
 def prepare_for_github():
     """Move all data files to main directory for GitHub deployment"""
@@ -33,8 +41,8 @@ def prepare_for_github():
             print(f"  {filename} already exists in main directory, skipping")
             continue
             
-        # Move file
-        shutil.move(csv_file, destination)
+        # Move file - data_chunks/ sits on the same volume, so this is a single rename
+        os.replace(csv_file, destination)
         print(f"  Moved {filename}")
     
     # Move metadata feather file
@@ -50,8 +58,8 @@ def prepare_for_github():
             print(f"  {filename} already exists in main directory, skipping")
             continue
             
-        # Move file
-        shutil.move(feather_file, destination)
+        # Move file - data_chunks/ sits on the same volume, so this is a single rename
+        os.replace(feather_file, destination)
         print(f"  Moved {filename}")
     
     print("\nFiles prepared for GitHub deployment!")
@@ -66,8 +74,36 @@ def prepare_for_github():
     
     return True
 
+def convert_chunks_to_parquet():
+    """Combine all peak data CSV chunks into a single zstd-compressed Parquet file"""
+    chunk_files = sorted(glob.glob(PEAK_DATA_CHUNK_PATTERN))
+    
+    if not chunk_files:
+        print("Error: no CSV chunks found to convert")
+        return False
+    
+    print(f"\nConverting {len(chunk_files)} CSV chunks to {PEAK_DATA_PARQUET}...")
+    
+    # Parse every chunk with the column types inferred from the first one so the tables concatenate
+    tables = [pacsv.read_csv(chunk_files[0])]
+    convert_options = pacsv.ConvertOptions(column_types=tables[0].schema)
+    for chunk_file in chunk_files[1:]:
+        tables.append(pacsv.read_csv(chunk_file, convert_options=convert_options))
+    
+    table = pa.concat_tables(tables)
+    pq.write_table(table, PEAK_DATA_PARQUET, compression="zstd", row_group_size=256_000)
+    
+    size_mb = os.path.getsize(PEAK_DATA_PARQUET) / (1024 * 1024)
+    print(f"  Wrote {PEAK_DATA_PARQUET}: {table.num_rows:,} rows ({size_mb:.1f} MB)")
+    return True
+
 if __name__ == "__main__":
-    success = prepare_for_github()
+    # The move step only applies while the chunks still sit in data_chunks/; once they are in
+    # the main directory (or with --parquet-only) the script just regenerates the Parquet file
+    if "--parquet-only" in sys.argv[1:] or not os.path.exists("data_chunks"):
+        success = convert_chunks_to_parquet()
+    else:
+        success = prepare_for_github() and convert_chunks_to_parquet()
     if success:
         print("\n✅ Ready for GitHub upload!")
     else:
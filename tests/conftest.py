@@ -0,0 +1,77 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pytest
+
+# The app modules live at the repository root rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_processor_chunked import DataProcessor, IMAGING_LINK_COLUMNS, METADATA_FEATHER
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """DataProcessor reading and writing inside a temporary directory"""
+    return DataProcessor(base_path=str(tmp_path))
+
+
+@pytest.fixture
+def peak_data():
+    """Peak rows shaped like load_peak_data output: export columns plus the plotted columns"""
+    enhancer_ids = ['AiE0002m', 'AiE0001m', 'AiE0003m', 'AiE0001m', 'AiE0002m', 'AiE0004m']
+    n = len(enhancer_ids)
+    return pd.DataFrame({
+        'cell_type': pd.Categorical(['2_L6_Glut', '11_CNU_HYa_GABA', '2_L6_Glut', '2_L6_Glut', '34_Immune', '11_CNU_HYa_GABA']),
+        'enhancer_id': pd.Categorical(enhancer_ids),
+        'chr': pd.Categorical(['chr2', 'chr1', 'chr3', 'chr1', 'chr2', 'chr4']),
+        'genomic_position': np.arange(1000, 1000 + n, dtype='int32'),
+        'signal_value': np.linspace(0.1, 0.6, n, dtype='float32'),
+        'region_type': pd.Categorical(['enhancer'] * n),
+        'distance_from_enhancer': np.zeros(n, dtype='int32'),
+        'enhancer_start': np.full(n, 900, dtype='int32'),
+        'enhancer_end': np.full(n, 1500, dtype='int32'),
+        'extended_start': np.full(n, 400, dtype='int32'),
+        'extended_end': np.full(n, 2000, dtype='int32'),
+        'start': np.array([20, 10, 30, 11, 21, 40], dtype='int32'),
+        'end': np.array([120, 110, 130, 111, 121, 140], dtype='int32'),
+        'position_index': np.arange(n, dtype='int32'),
+        'accessibility_score': np.linspace(0.5, 1.0, n, dtype='float32'),
+    })
+
+
+@pytest.fixture
+def metadata():
+    """Renamed metadata rows as load_metadata sees them, before the link lists are added"""
+    frame = pd.DataFrame({
+        'enhancer_id': ['AiE0001m', 'AiE0001m', 'AiE0002m', 'AiE0003m', 'AiE0004m'],
+        'Hall_of_fame': ['TRUE', 'TRUE', 'TRUE', 'FALSE', 'TRUE'],
+        'cargo': [None, 'SYFP2', 'iCre', 'SYFP2', 'SYFP2'],
+        'experiment': ['EPI', 'LIGHTSHEET', 'EPI', 'EPI', 'LIGHTSHEET'],
+        'proximal_gene': ['Gad2', 'Gad2', 'Slc17a7', 'Pvalb', 'Sst'],
+        'GC delivered': ['1e11', '1e11', '5e10', '1e11', '5e10'],
+    })
+    for col in IMAGING_LINK_COLUMNS:
+        frame[col] = None
+    frame['image_link'] = ['https://a/1.png, https://a/2.png', 'FALSE', ' ', None, 'https://a/3.png']
+    frame['viewer_link'] = ['FALSE', 'https://v/1', None, '', ' https://v/2 ,https://v/3 ']
+    return frame
+
+
+@pytest.fixture
+def source_files(tmp_path, peak_data, metadata):
+    """Peak CSV chunk and metadata Feather export, with the export's own column names"""
+    peak_data.to_csv(tmp_path / 'part1_1751576434359_chunk_01_of_01.csv', index=False)
+    export_names = {
+        'enhancer_id': 'Enhancer_ID', 'cargo': 'Cargo', 'experiment': 'Experiment_Type',
+        'proximal_gene': 'Proximal_Gene', 'image_link': 'Image_link', 'neuroglancer_1': 'Neuroglancer 1',
+        'neuroglancer_3': 'Neuroglancer 3', 'viewer_link': 'Viewer Link', 'coronal_mip': 'Coronal_MIP',
+        'sagittal_mip': 'Sagittal_MIP'
+    }
+    # Columns a raw export carries that the app never reads
+    export = metadata.rename(columns=export_names).assign(Notes='')
+    feather.write_feather(pa.Table.from_pandas(export, preserve_index=False), tmp_path / METADATA_FEATHER)
+    return tmp_path
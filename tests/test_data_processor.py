@@ -0,0 +1,134 @@
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data_processor_chunked import DataProcessor, IMAGING_LINK_COLUMNS, METADATA_FEATHER, PEAK_DATA_PARQUET, PROCESSED_DATA_FILES
+
+# Peak columns read by app.py and visualization.py
+APP_PEAK_COLUMNS = ['enhancer_id', 'cell_type', 'chr', 'start', 'end', 'position_index', 'accessibility_score']
+
+
+def test_processed_round_trip_keeps_peak_columns(processor, peak_data, metadata):
+    processor.add_imaging_link_lists(metadata)
+    hof_enhancers = processor.extract_hof_enhancers(metadata, peak_data)
+    processor.save_processed_data(peak_data, metadata, hof_enhancers)
+
+    loaded_peak, loaded_metadata, loaded_hof = processor.load_processed_data()
+
+    assert set(APP_PEAK_COLUMNS) <= set(loaded_peak.columns)
+    pd.testing.assert_frame_equal(loaded_peak, peak_data)
+    pd.testing.assert_frame_equal(loaded_hof, hof_enhancers)
+    assert loaded_metadata['image_link_list'].tolist() == metadata['image_link_list'].tolist()
+
+
+def test_load_all_data_same_frames_from_sources_and_processed_files(source_files):
+    cold = DataProcessor(base_path=str(source_files)).load_all_data()
+    assert all((source_files / filename).exists() for filename in PROCESSED_DATA_FILES.values())
+    warm = DataProcessor(base_path=str(source_files)).load_all_data()
+
+    for cold_frame, warm_frame in zip(cold, warm):
+        pd.testing.assert_frame_equal(warm_frame, cold_frame)
+    cold_metadata, warm_metadata = cold[1], warm[1]
+    assert 'Notes' not in cold_metadata.columns
+    # Normalized link columns survive, and the split lists stay Python lists
+    assert warm_metadata['image_link'].notna().tolist() == [True, False, False, False, True]
+    for col in IMAGING_LINK_COLUMNS:
+        assert warm_metadata[f"{col}_list"].map(type).eq(list).all()
+        assert warm_metadata[f"{col}_list"].tolist() == cold_metadata[f"{col}_list"].tolist()
+
+
+def test_processed_data_missing_file_is_a_miss(processor, tmp_path, peak_data, metadata):
+    processor.add_imaging_link_lists(metadata)
+    processor.save_processed_data(peak_data, metadata, processor.extract_hof_enhancers(metadata, peak_data))
+    (tmp_path / PROCESSED_DATA_FILES['hof_enhancers']).unlink()
+
+    assert processor.load_processed_data() is None
+
+
+def test_processed_data_rebuilt_when_sources_change(processor, tmp_path, peak_data, metadata):
+    metadata_path = tmp_path / METADATA_FEATHER
+    metadata_path.write_bytes(b'metadata v1')
+    processor.add_imaging_link_lists(metadata)
+    processor.save_processed_data(peak_data, metadata, processor.extract_hof_enhancers(metadata, peak_data))
+    assert processor.load_processed_data() is not None
+
+    # A re-exported metadata file with the same size is caught by its mtime
+    metadata_path.write_bytes(b'metadata v2')
+    stat = metadata_path.stat()
+    os.utime(metadata_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert processor.load_processed_data() is None
+
+    # So is a newly generated peak data file
+    processor.save_processed_data(peak_data, metadata, processor.extract_hof_enhancers(metadata, peak_data))
+    (tmp_path / PEAK_DATA_PARQUET).write_bytes(b'parquet')
+    assert processor.load_processed_data() is None
+
+
+@pytest.mark.parametrize('source', ['parquet', 'csv'])
+@pytest.mark.parametrize('hof_dedup, deduplicated', [('1', True), ('true', True), ('0', False), ('', False)])
+def test_hof_dedup_applies_to_either_source(processor, tmp_path, monkeypatch, peak_data, source, hof_dedup, deduplicated):
+    peak_data = pd.concat([peak_data, peak_data.iloc[:2]], ignore_index=True)
+    if source == 'parquet':
+        pq.write_table(pa.Table.from_pandas(peak_data, preserve_index=False), tmp_path / PEAK_DATA_PARQUET)
+    else:
+        peak_data.to_csv(tmp_path / 'part1_1751576434359_chunk_01_of_01.csv', index=False)
+    monkeypatch.setenv('HOF_DEDUP', hof_dedup)
+
+    loaded = processor.load_peak_data()
+
+    assert len(loaded) == (len(peak_data) - 2 if deduplicated else len(peak_data))
+
+
+def groupby_first_hof_enhancers(metadata, peak_data):
+    """HOF records built the original way: groupby-first on object ids, then a merge"""
+    hof_ids = metadata.loc[metadata['Hall_of_fame'] == 'TRUE', 'enhancer_id'].unique()
+    peak_data = peak_data.astype({'enhancer_id': object, 'chr': object})
+    first_occurrences = peak_data[peak_data['enhancer_id'].isin(hof_ids)].groupby('enhancer_id').first().reset_index()
+    hof_df = first_occurrences[['enhancer_id', 'chr', 'start', 'end']]
+    metadata_for_merge = metadata.groupby('enhancer_id').first().reset_index()
+    return hof_df.merge(metadata_for_merge[['enhancer_id', 'cargo', 'experiment', 'proximal_gene', 'GC delivered']],
+                        on='enhancer_id', how='left')
+
+
+@pytest.mark.parametrize('layout', ['categorical', 'object'])
+def test_extract_hof_enhancers_matches_groupby_first(processor, peak_data, metadata, layout):
+    # HOF ids that are categories without peak rows, before and after every id with rows
+    peak_data['enhancer_id'] = peak_data['enhancer_id'].cat.add_categories(['AiE0000m', 'AiE0009m'])
+    metadata = pd.concat([metadata, pd.DataFrame({
+        'enhancer_id': ['AiE0000m', 'AiE0009m'], 'Hall_of_fame': ['TRUE', 'TRUE'], 'cargo': ['SYFP2', 'SYFP2']
+    })], ignore_index=True)
+    expected = groupby_first_hof_enhancers(metadata, peak_data)
+
+    if layout == 'object':
+        peak_data = peak_data.astype({'enhancer_id': object, 'chr': object})
+
+    hof_enhancers = processor.extract_hof_enhancers(metadata, peak_data)
+
+    assert hof_enhancers['enhancer_id'].tolist() == ['AiE0001m', 'AiE0002m', 'AiE0004m']
+    # The duplicated AiE0001m metadata keeps groupby-first semantics: first non-null cargo
+    assert hof_enhancers.loc[0, 'cargo'] == 'SYFP2'
+    pd.testing.assert_frame_equal(hof_enhancers, expected, check_dtype=False)
+    assert hof_enhancers[['start', 'end']].dtypes.eq('int32').all()
+
+
+def test_add_imaging_link_lists_normalizes_missing_links(processor, metadata):
+    metadata = processor.add_imaging_link_lists(metadata.drop(columns='sagittal_mip'))
+
+    # 'FALSE', blank and whitespace-only values all mean no link
+    assert metadata['image_link'].isna().tolist() == [False, True, True, True, False]
+    assert metadata['viewer_link'].tolist()[1] == 'https://v/1'
+    assert metadata['viewer_link'].isna().tolist() == [True, False, True, True, False]
+
+    assert metadata['image_link_list'].tolist() == [
+        ['https://a/1.png', 'https://a/2.png'], [], [], [], ['https://a/3.png']
+    ]
+    assert metadata['viewer_link_list'].tolist() == [
+        [], ['https://v/1'], [], [], ['https://v/2', 'https://v/3']
+    ]
+    assert metadata['coronal_mip_list'].tolist() == [[]] * len(metadata)
+    # A column missing from the export still gets an empty list per row
+    assert metadata['sagittal_mip_list'].tolist() == [[]] * len(metadata)
+    assert {f"{col}_list" for col in IMAGING_LINK_COLUMNS} <= set(metadata.columns)
@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 import streamlit as st
 from typing import Optional, List, Dict, Any
+from cell_type_order import cell_type_sort_key
 
 class VisualizationGenerator:
     def __init__(self):
@@ -35,16 +36,7 @@ class VisualizationGenerator:
             return self.create_empty_plot("No peak data available for visualization")
         
         # Get unique cell types and sort them numerically by their leading numbers
-        cell_types = peak_data['cell_type'].unique()
-        
-        # Custom sorting function to extract and sort by leading numbers
-        def extract_cell_type_number(cell_type):
-            import re
-            # Extract the leading number from cell type names like "11_CNU_HYa_GABA"
-            match = re.match(r'^(\d+)', str(cell_type))
-            return int(match.group(1)) if match else 999
-        
-        cell_types = sorted(cell_types, key=extract_cell_type_number)
+        cell_types = sorted(peak_data['cell_type'].unique(), key=cell_type_sort_key)
         num_cell_types = len(cell_types)
         
         if num_cell_types == 0:
@@ -68,22 +60,19 @@ class VisualizationGenerator:
         
         # Process data for each cell type
         for i, cell_type in enumerate(cell_types, 1):
-            cell_data = peak_data[peak_data['cell_type'] == cell_type].copy()
+            cell_data = peak_data[peak_data['cell_type'] == cell_type]
             
             if not cell_data.empty:
                 # Sort by position index for proper genomic ordering
                 cell_data = cell_data.sort_values('position_index')
                 
-                # Use actual genomic positions from the high-resolution data
-                cell_data['genomic_position'] = cell_data['position_index']
-                
                 # Get consistent color for this cell type
                 color = self.get_cell_type_color(cell_type, i-1)
                 
                 # Create the accessibility track as a filled area plot (more genomic browser-like)
                 fig.add_trace(
                     go.Scatter(
-                        x=cell_data['genomic_position'],
+                        x=cell_data['position_index'],  # Actual genomic positions from the high-resolution data
                         y=cell_data['accessibility_score'],
                         mode='lines',
                         fill='tozeroy',
@@ -106,7 +95,7 @@ class VisualizationGenerator:
                 if not high_accessibility.empty:
                     fig.add_trace(
                         go.Scatter(
-                            x=high_accessibility['genomic_position'],
+                            x=high_accessibility['position_index'],
                             y=high_accessibility['accessibility_score'],
                             mode='markers',
                             marker=dict(
@@ -207,7 +196,7 @@ class VisualizationGenerator:
         
         # Calculate mean accessibility per enhancer per cell type
         comparison_data = (peak_data[peak_data['enhancer_id'].isin(enhancer_ids)]
-                          .groupby(['enhancer_id', 'cell_type'])['accessibility_score']
+                          .groupby(['enhancer_id', 'cell_type'], observed=True)['accessibility_score']
                           .mean()
                           .reset_index())
         
@@ -297,7 +286,7 @@ class VisualizationGenerator:
             )
         
         # 2. Bar chart of enhancer count by cell type
-        cell_type_counts = peak_data.groupby('cell_type')['enhancer_id'].nunique().head(15)
+        cell_type_counts = peak_data.groupby('cell_type', observed=True)['enhancer_id'].nunique().head(15)
         fig.add_trace(
             go.Bar(
                 x=cell_type_counts.index, 
@@ -310,7 +299,7 @@ class VisualizationGenerator:
         )
         
         # 3. Top enhancers by mean accessibility
-        mean_acc = peak_data.groupby('enhancer_id')['accessibility_score'].mean().nlargest(20)
+        mean_acc = peak_data.groupby('enhancer_id', observed=True)['accessibility_score'].mean().nlargest(20)
         fig.add_trace(
             go.Bar(
                 x=mean_acc.index, 
@@ -323,7 +312,7 @@ class VisualizationGenerator:
         )
         
         # 4. Genomic span analysis
-        genomic_info = peak_data.groupby('enhancer_id').agg({
+        genomic_info = peak_data.groupby('enhancer_id', observed=True).agg({
             'start': 'first',
             'end': 'first',
             'accessibility_score': 'mean'
@@ -381,7 +370,7 @@ class VisualizationGenerator:
             return self.create_empty_plot(f"No data available for cell type: {cell_type}")
         
         # Group by enhancer and calculate statistics
-        enhancer_stats = cell_data.groupby('enhancer_id').agg({
+        enhancer_stats = cell_data.groupby('enhancer_id', observed=True).agg({
             'accessibility_score': ['mean', 'max', 'std', 'count'],
             'chr': 'first',
             'start': 'first',